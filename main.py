@@ -1,18 +1,43 @@
+import os
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import matplotlib.pyplot as plt
 import streamlit as st
 from iso3166 import countries
 
+# bottleneck is optional; without it rolling means fall back to pandas
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+
+DATA_PATH = 'Space+Missions+(start)/mission_launches.csv'
+
+# Upper bound on the points sent to the browser for a single line trace
+MAX_PLOT_POINTS = 1000
+
 
 # Load Data
+# The file's modification time is part of the cache key, so the preprocessed frame is
+# reused across reruns and only rebuilt when the CSV changes on disk.
 @st.cache_data
-def load_data():
-    df_data = pd.read_csv('Space+Missions+(start)/mission_launches.csv')
-    df_data['Date'] = pd.to_datetime(df_data['Date'], errors='coerce')
-    print(df_data.dtypes)
-
-    df_data['Country'] = df_data['Location'].str.split(', ').str[-1]
+def load_data(mtime):
+    # Arrow-backed parsing with the dtypes declared up front instead of inferred
+    df_data = pd.read_csv(DATA_PATH, engine='pyarrow', dtype={
+        'Organisation': 'category',
+        'Mission_Status': 'category',
+        'Location': 'string[pyarrow]'
+    })
+    # Dates look like 'Fri Aug 07, 2020 05:12 UTC', some without the time part
+    df_data['Date'] = pd.to_datetime(df_data['Date'], format='mixed', errors='coerce', utc=True)
+    # Sorted by Date so date ranges can be sliced with searchsorted
+    df_data = df_data.dropna(subset=['Date']).sort_values('Date').reset_index(drop=True)
+    df_data['Year'] = df_data['Date'].dt.year.astype('int16')
+    df_data['Month'] = df_data['Date'].dt.tz_localize(None).dt.to_period('M')
+
+    df_data['Country'] = df_data['Location'].str.rpartition(', ')[2]
     update = {
         'Russia': 'Russian Federation',
         'New Mexico': 'USA',
@@ -28,42 +53,161 @@ def load_data():
         'United Kingdom': 'United Kingdom of Great Britain and Northern Ireland',
         'Pacific Ocean': 'USA'
     }
-    df_data['Country'] = df_data['Country'].replace(update)
-    df_data['Country Code'] = df_data['Country'].apply(lambda x: (countries.get(x).alpha3))
+    df_data['Country'] = df_data['Country'].replace(update).astype('category')
+    # Look up each distinct country once instead of once per row; mapping a categorical only maps
+    # its categories, so Country Code comes out categorical as well
+    code_map = {country: countries.get(country).alpha3 for country in df_data['Country'].cat.categories}
+    df_data['Country Code'] = df_data['Country'].map(code_map)
     return df_data
 
 
-df_data = load_data()
+@st.cache_data
+def load_pre1992_data(df_data):
+    cutoff = df_data['Date'].searchsorted(pd.Timestamp('1992-01-01', tz='UTC'))
+    return df_data.iloc[:cutoff]
 
-# Title and description
-st.title("Space Mission Launches Analysis")
-st.write("This app analyzes space mission launches over time, by country, organization, and other dimensions.")
 
-# Dropdown menu to select which analysis to show
-analysis_options = [
-    "Number of Launches by Organisation",
-    "Number of Launches by Country (Choropleth)",
-    "Launches Over Time (Yearly and Monthly)",
-    "Mission Success and Failures",
-    "Cold War Space Race: USA vs USSR",
-    "Top Organization per Year",
-    "Mission Failures Over Time"
-]
-selected_analysis = st.selectbox("Select Analysis", analysis_options)
-
-if selected_analysis == "Number of Launches by Organisation":
-    # Number of launches per organization
-    no_of_launches_per_company = df_data['Organisation'].value_counts().reset_index()
+# Rolling mean over a fixed window, NaN until the window is full (same as Series.rolling(window).mean())
+def rolling_mean(values, window):
+    if bn is None:
+        return values.rolling(window).mean().to_numpy()
+    return bn.move_mean(values.to_numpy(dtype='float64'), window=window, min_count=window)
+
+
+# Aggregations
+# Each analysis reduces df_data to a small summary frame. They are cached separately so a rerun
+# only redraws the figure instead of aggregating the data again.
+@st.cache_data
+def count_launches_by_organisation(df_data):
+    # Ascending order is the bar order of the chart, so the browser does not have to re-sort
+    no_of_launches_per_company = df_data['Organisation'].value_counts(sort=False).sort_values().reset_index()
     no_of_launches_per_company.columns = ['Organisation', 'Launches']
+    return no_of_launches_per_company
+
+
+@st.cache_data
+def count_launches_by_country(df_data):
+    # Country Code is determined by Country, so grouping on the code alone is enough
+    launches_by_country = df_data.groupby('Country Code', observed=True, sort=False).size().reset_index(
+        name='Launch Count')
+    code_to_country = df_data[['Country Code', 'Country']].drop_duplicates().set_index('Country Code')['Country']
+    launches_by_country['Country'] = launches_by_country['Country Code'].map(code_to_country)
+    return launches_by_country
+
+
+@st.cache_data
+def count_launches_per_year(df_data):
+    return df_data.groupby('Year', sort=False).size().sort_index().reset_index(name='Launches')
+
+
+@st.cache_data
+def count_launches_month_on_month(df_data):
+    launches_per_month = df_data.groupby('Month', sort=False).size()
+    # Months without a launch count as 0, so the 12-month window always spans a year
+    all_months = pd.period_range(launches_per_month.index.min(), launches_per_month.index.max(), freq='M')
+    launches_per_month = launches_per_month.reindex(all_months, fill_value=0).to_timestamp()
+    launches_month_on_month = launches_per_month.rename_axis('Date').reset_index(name='Launch Count')
+    launches_month_on_month['Rolling Average'] = rolling_mean(launches_month_on_month['Launch Count'], 12)
+    return launches_month_on_month
+
+
+@st.cache_data
+def count_mission_status(df_data):
+    return df_data['Mission_Status'].value_counts()
+
+
+@st.cache_data
+def count_mission_failures_per_year(df_data):
+    mission_status_year_on_year = df_data.groupby(['Year', 'Mission_Status'], observed=True, sort=False).size()
+    mission_status_year_on_year = mission_status_year_on_year.sort_index().reset_index(name='Total')
+    return mission_status_year_on_year[mission_status_year_on_year['Mission_Status'] == 'Failure']
+
+
+@st.cache_data
+def count_cold_war_launches(df_data):
+    # Filter data for years before or in 1991
+    cold_war = load_pre1992_data(df_data)
+
+    # Label Russian and Kazakh launches as USSR in a separate Series, leaving the frame untouched
+    # ('USSR' has to be added as a category before it can be used as a value)
+    soviet = cold_war['Country'].isin(['Russian Federation', 'Kazakhstan'])
+    cold_war_country = cold_war['Country'].cat.add_categories(['USSR']).where(~soviet, 'USSR')
+
+    # Group by year and country to get launch counts
+    cold_war_launches = cold_war.groupby(['Year', cold_war_country], observed=True, sort=False).size().reset_index(
+        name='Launch Count')
+
+    # Filter for USA and USSR launches
+    return cold_war_launches.loc[cold_war_launches['Country'].isin(['USA', 'USSR'])]
+
+
+@st.cache_data
+def count_top10_organisation_launches(df_data):
+    # Get the top 10 organizations based on total launches
+    top10_organizations = df_data['Organisation'].value_counts().nlargest(10).index
+
+    # Group the launches of only those organizations by year
+    launches_top10_organizations = df_data[df_data['Organisation'].isin(top10_organizations)].groupby(
+        ['Year', 'Organisation'], observed=True, sort=False).size()
+    return launches_top10_organizations.sort_index().reset_index(name='Launch Count')
+
+
+@st.cache_data
+def calculate_failure_percentage_per_year(df_data):
+    # Share of each mission status per year, so failures are divided by the totals of the same year
+    mission_status_share = pd.crosstab(df_data['Year'], df_data['Mission_Status'], normalize='index')
+    return (mission_status_share['Failure'] * 100).rename('Percentage').reset_index()
+
+
+# Downsample a line trace with Largest-Triangle-Three-Buckets, which keeps the peaks and dips
+# that a plain every-nth-point thinning would drop
+def downsample_lttb(frame, x, y, max_points=MAX_PLOT_POINTS):
+    frame = frame.dropna(subset=[y])
+    n = len(frame)
+    if n <= max_points or max_points < 3:
+        return frame
+
+    x_values = frame[x]
+    if pd.api.types.is_datetime64_any_dtype(x_values):
+        x_values = (x_values - x_values.iloc[0]) / pd.Timedelta(days=1)
+    x_values = x_values.to_numpy(dtype='float64')
+    y_values = frame[y].to_numpy(dtype='float64')
+
+    # First and last points are always kept; the rest is split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    keep = np.empty(max_points, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x_values[end:next_end].mean()
+        next_y = y_values[end:next_end].mean()
+        # Pick the point forming the largest triangle with the previous pick and the next bucket's average
+        area = np.abs((x_values[previous] - next_x) * (y_values[start:end] - y_values[previous]) -
+                      (x_values[previous] - x_values[start:end]) * (next_y - y_values[previous]))
+        previous = start + int(area.argmax())
+        keep[i + 1] = previous
+    return frame.iloc[keep]
+
+
+# Analyses
+# One function per entry of the dropdown. They are cached as well: for an unchanged df_data,
+# Streamlit replays the headings and charts they produced instead of rebuilding the figures.
+@st.cache_data
+def show_launches_by_organisation(df_data):
+    # Number of launches per organization
+    no_of_launches_per_company = count_launches_by_organisation(df_data)
 
     st.write("### Number of Launches by Organisation")
     fig = px.bar(no_of_launches_per_company, x='Organisation', y='Launches', color='Organisation',
                  title="Number of Space Mission Launches by Organisation")
-    fig.update_layout(xaxis={'categoryorder': 'total ascending'})
     st.plotly_chart(fig)
 
-elif selected_analysis == "Number of Launches by Country (Choropleth)":
-    launches_by_country = df_data.groupby(['Country', 'Country Code']).size().reset_index(name='Launch Count')
+
+@st.cache_data
+def show_launches_by_country(df_data):
+    launches_by_country = count_launches_by_country(df_data)
 
     st.write("### Launches by Country (Choropleth Map)")
     fig = px.choropleth(
@@ -76,95 +220,55 @@ elif selected_analysis == "Number of Launches by Country (Choropleth)":
     )
     st.plotly_chart(fig)
 
-elif selected_analysis == "Launches Over Time (Yearly and Monthly)":
-    # Ensure 'Date' column is in datetime format
-    df_data['Date'] = pd.to_datetime(df_data['Date'], errors='coerce')  # Convert to datetime and handle errors
-
-    # Drop rows where Date could not be converted (optional, depending on data)
-    df_data = df_data.dropna(subset=['Date'])
 
+@st.cache_data
+def show_launches_over_time(df_data):
     # Yearly launches
-    launches_per_year = df_data.groupby(df_data['Date'].dt.year).size()
+    launches_per_year = count_launches_per_year(df_data)
 
     st.write("### Launches Over Time (Yearly)")
 
-    plt.figure(figsize=(20, 6))
-    plt.plot(launches_per_year, marker='o', linestyle='-', color='red')
-    plt.xlabel('Year')
-    plt.ylabel('Number of Launches')
-    plt.title('Number of Launches per Year')
-    plt.grid(axis='x', linestyle='--', alpha=0.7)
-    plt.xticks(launches_per_year.index, rotation=45)
-    plt.margins(x=0)
-    st.pyplot(plt)
+    fig = px.line(launches_per_year, x='Year', y='Launches', markers=True, render_mode='webgl',
+                  labels={'Launches': 'Number of Launches'}, title='Number of Launches per Year')
+    fig.update_traces(line_color='red')
+    st.plotly_chart(fig)
 
     # Monthly launches
     st.write("### Launches Over Time (Monthly)")
-    launches_month_on_month = df_data.groupby('Date').size().reset_index(name='Launch Count')
-    launches_month_on_month['Rolling Average'] = launches_month_on_month['Launch Count'].rolling(30).mean()
+    launches_month_on_month = count_launches_month_on_month(df_data)
 
-    fig = px.line(launches_month_on_month, x='Date', y='Launch Count', title="Monthly Launches with Rolling Average")
-    fig.add_scatter(x=launches_month_on_month['Date'], y=launches_month_on_month['Rolling Average'], mode='lines',
+    launch_count_points = downsample_lttb(launches_month_on_month, 'Date', 'Launch Count')
+    rolling_average_points = downsample_lttb(launches_month_on_month, 'Date', 'Rolling Average')
+
+    fig = px.line(launch_count_points, x='Date', y='Launch Count', title="Monthly Launches with Rolling Average")
+    fig.add_scatter(x=rolling_average_points['Date'], y=rolling_average_points['Rolling Average'], mode='lines',
                     name='Rolling Average')
     st.plotly_chart(fig)
 
-elif selected_analysis == "Mission Success and Failures":
-    # Ensure 'Date' column is in datetime format
-    df_data['Date'] = pd.to_datetime(df_data['Date'], errors='coerce')  # Convert to datetime and handle errors
-
-    # Drop rows where Date could not be converted (optional, depending on data)
-    df_data = df_data.dropna(subset=['Date'])
 
+@st.cache_data
+def show_mission_success_and_failures(df_data):
     # Mission success/failure
-    successful_missions = len(df_data[df_data['Mission_Status'] == 'Success'])
-    failed_missions = len(df_data[df_data['Mission_Status'] == 'Failure'])
+    mission_status_counts = count_mission_status(df_data)
+    successful_missions = mission_status_counts.get('Success', 0)
+    failed_missions = mission_status_counts.get('Failure', 0)
 
     st.write(f"### Number of Successful Missions: {successful_missions}")
     st.write(f"### Number of Failed Missions: {failed_missions}")
 
     # Mission status year-on-year
-    mission_status_year_on_year = df_data.groupby(
-        [df_data['Date'].dt.year.rename('Year'), 'Mission_Status']).size().reset_index(name='Total')
-
-    mission_failures_year_on_year = mission_status_year_on_year[
-        mission_status_year_on_year['Mission_Status'] == 'Failure']
+    mission_failures_year_on_year = count_mission_failures_per_year(df_data)
 
     st.write("### Mission Failures Year-on-Year")
-    plt.figure(figsize=(20, 6))
-    plt.plot(mission_failures_year_on_year['Year'], mission_failures_year_on_year['Total'], marker='o', linestyle='-')
-    plt.xlabel('Year')
-    plt.ylabel('Mission Failures')
-    plt.title('Total Number of Mission Failures Year on Year')
-    plt.grid(True)
-    st.pyplot(plt)
-
-
-elif selected_analysis == "Cold War Space Race: USA vs USSR":
-    cold_war_update = {
-        'Russian Federation': 'USSR',
-        'Kazakhstan': 'USSR'
-    }
-
-    # Convert 'Date' column to datetime format
-    df_data['Date'] = pd.to_datetime(df_data['Date'], errors='coerce')
-
-    # Filter out rows where 'Date' could not be converted
-    df_data = df_data.dropna(subset=['Date'])
-
-    # Ensure 'Country' values are not NaN before replacement
-    df_data['Country'] = df_data['Country'].fillna('Unknown')
-
-    # Replace 'Country' with 'USSR' for relevant countries before 1991
-    df_data.loc[df_data['Date'].dt.year <= 1991, 'Country'] = df_data['Country'].replace(cold_war_update)
-
-    # Filter data for years before or in 1991
-    cold_war = df_data[df_data['Date'].dt.year <= 1991]
+    fig = px.line(mission_failures_year_on_year, x='Year', y='Total', markers=True, render_mode='webgl',
+                  labels={'Total': 'Mission Failures'}, title='Total Number of Mission Failures Year on Year')
+    st.plotly_chart(fig)
 
-    # Group by year and country to get launch counts
-    cold_war_launches = cold_war.groupby([cold_war['Date'].dt.year.rename('Year'), 'Country']).size().reset_index(name='Launch Count')
 
-    # Filter for USA and USSR launches
-    cold_war_launches_USA_USSR = cold_war_launches.loc[cold_war_launches['Country'].isin(['USA', 'USSR'])]
+@st.cache_data
+def show_cold_war_space_race(df_data):
+    # Launches per year for USA and USSR up to 1991
+    cold_war_launches_USA_USSR = count_cold_war_launches(df_data)
 
     st.write("### Cold War Space Race: USA vs USSR")
 
@@ -177,45 +281,46 @@ elif selected_analysis == "Cold War Space Race: USA vs USSR":
         st.plotly_chart(fig)
 
 
-elif selected_analysis == "Top Organization per Year":
-    # Convert 'Date' column to datetime format
-    df_data['Date'] = pd.to_datetime(df_data['Date'], errors='coerce')
-
-    # Filter out rows where 'Date' could not be converted
-    df_data = df_data.dropna(subset=['Date'])  # This will remove any rows with NaT in 'Date'
-
-    # Group by year and organization to get launch counts
-    launches_top10_organizations = df_data.groupby(
-        [df_data['Date'].dt.year.rename('Year'), 'Organisation']).size().reset_index(name='Launch Count')
-
-    # Get the top 10 organizations based on total launches
-    top10_organizations = launches_top10_organizations.groupby('Organisation')['Launch Count'].sum().sort_values(
-        ascending=False).head(10).reset_index()
-
-    # Merge to filter only top 10 organizations
-    launches_top10_organizations = launches_top10_organizations.merge(top10_organizations['Organisation'],
-                                                                      on='Organisation', how='inner')
+@st.cache_data
+def show_top_organisations_per_year(df_data):
+    # Yearly launches of the top 10 organizations by total launches
+    launches_top10_organizations = count_top10_organisation_launches(df_data)
 
     st.write("### Top 10 Organizations by Number of Launches Over Time")
     fig = px.bar(launches_top10_organizations, x="Year", y="Launch Count", color="Organisation")
     st.plotly_chart(fig)
 
 
-elif selected_analysis == "Mission Failures Over Time":
-    total_mission_status_year_on_year = df_data.groupby(df_data['Date'].dt.year.rename('Year')).size().reset_index(
-        name='Total Missions')
-    mission_failures_year_on_year = df_data[df_data['Mission_Status'] == 'Failure'].groupby(
-        df_data['Date'].dt.year.rename('Year')).size().reset_index(name='Failures')
-    mission_failures_year_on_year['Percentage'] = (mission_failures_year_on_year['Failures'] /
-                                                   total_mission_status_year_on_year['Total Missions']) * 100
+@st.cache_data
+def show_mission_failures_over_time(df_data):
+    mission_failures_year_on_year = calculate_failure_percentage_per_year(df_data)
 
     st.write("### Percentage of Mission Failures Over Time")
-    plt.figure(figsize=(20, 6))
-    plt.plot(mission_failures_year_on_year['Year'], mission_failures_year_on_year['Percentage'], marker='o',
-             linestyle='-')
-    plt.xlabel('Year')
-    plt.ylabel('Mission Failures (%)')
-    plt.title('Percentage of Failures over Time')
-    plt.grid(True)
-    st.pyplot(plt)
+    fig = px.line(mission_failures_year_on_year, x='Year', y='Percentage', markers=True, render_mode='webgl',
+                  labels={'Percentage': 'Mission Failures (%)'}, title='Percentage of Failures over Time')
+    st.plotly_chart(fig)
+
+
+# Dropdown label -> function showing that analysis
+ANALYSES = {
+    "Number of Launches by Organisation": show_launches_by_organisation,
+    "Number of Launches by Country (Choropleth)": show_launches_by_country,
+    "Launches Over Time (Yearly and Monthly)": show_launches_over_time,
+    "Mission Success and Failures": show_mission_success_and_failures,
+    "Cold War Space Race: USA vs USSR": show_cold_war_space_race,
+    "Top Organization per Year": show_top_organisations_per_year,
+    "Mission Failures Over Time": show_mission_failures_over_time
+}
+
+
+# The analyses only read from df_data. Anything derived for a single analysis is built as a
+# separate Series or frame, so the cached data stays exactly as load_data() produced it.
+df_data = load_data(os.path.getmtime(DATA_PATH))
 
+# Title and description
+st.title("Space Mission Launches Analysis")
+st.write("This app analyzes space mission launches over time, by country, organization, and other dimensions.")
+
+# Dropdown menu to select which analysis to show
+selected_analysis = st.selectbox("Select Analysis", list(ANALYSES))
+ANALYSES[selected_analysis](df_data)